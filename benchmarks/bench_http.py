@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+End-to-end HTTP benchmark for IdeaPy.
+
+Builds a fixture document root in a temporary directory, starts IdeaPy on
+loopback against it (as a separate process, exactly like `python3 ideapy.py`)
+and drives every scenario with a local, stdlib-only load generator.
+
+For every scenario requests per second, latency percentiles and server RSS
+are written to a JSON result file, then compared against a stored baseline.
+
+Example usage:
+$ python3 benchmarks/bench_http.py --duration 5 --concurrency 8
+$ python3 benchmarks/bench_http.py --save-baseline
+$ python3 benchmarks/bench_http.py --scenarios static_small,page_simple
+$ python3 benchmarks/bench_http.py --scenarios static_small,static_range --set STATIC_FRONTEND=true
+
+Exit code is 1 when any scenario regressed past the thresholds.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import http.client
+import multiprocessing
+
+from collections import OrderedDict
+from typing import List, Dict, Optional
+
+
+BENCH_DIR = os.path.dirname(os.path.realpath(__file__))
+IDEAPY_PATHNAME = os.path.realpath(os.path.join(BENCH_DIR, '..', 'ideapy.py'))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results.json')
+
+SMALL_FILE_SIZE = 1024
+LARGE_FILE_SIZE = 8 * 1024 * 1024
+LISTING_ENTRIES = 200
+RANGE_LENGTH = 64 * 1024
+
+
+#name -> (method, path, headers, body)
+SCENARIOS = [
+    ('static_small', ('GET', '/static/small.txt', {}, None)),
+    ('static_large', ('GET', '/static/large.bin', {}, None)),
+    ('static_range', ('GET', '/static/large.bin', {'Range': 'bytes=0-{end}'.format(end=RANGE_LENGTH - 1)}, None)),
+    ('directory_listing', ('GET', '/listing/', {}, None)),
+    ('page_simple', ('GET', '/page_simple/', {}, None)),
+    ('page_imports', ('GET', '/page_imports/', {}, None)),
+    ('page_resident', ('GET', '/page_resident/', {}, None)),
+    ('page_stream', ('GET', '/page_stream/', {}, None)),
+    ('page_session', ('GET', '/page_session/', {}, None)),
+    ('wsgi_get', ('GET', '/page_wsgi/?q=/hello', {}, None)),
+    ('wsgi_post', ('POST', '/page_wsgi/?q=/echo', {'Content-Type': 'application/octet-stream'}, b'x' * 4096)),
+    ('wsgi_mount', ('GET', '/mounted/hello', {}, None)),
+]
+
+
+FIXTURE_PAGES = {
+    'page_simple/index.py': """
+import cherrypy
+
+cherrypy.response.body = bytes('Hello World from page_simple', 'utf8')
+""",
+
+    'page_imports/helpers.py': """
+import re
+
+WORD_RE = re.compile(r'[a-z]+')
+
+
+def count_words(text):
+    return len(WORD_RE.findall(text))
+""",
+
+    'page_imports/index.py': """
+import cherrypy
+import json
+import decimal
+import email.parser
+import xml.dom.minidom
+import http.cookies
+import urllib.request
+
+from helpers import count_words
+
+data = json.dumps({'words': count_words('the quick brown fox'), 'pi': str(decimal.Decimal('3.14159'))})
+cherrypy.response.headers['Content-Type'] = 'application/json'
+cherrypy.response.body = bytes(data, 'utf8')
+""",
+
+    'page_resident/index.py': """
+import json
+import decimal
+import email.parser
+import xml.dom.minidom
+
+from helpers import count_words
+
+
+def handle(request):
+    data = json.dumps({'words': count_words('the quick brown fox'), 'pi': str(decimal.Decimal('3.14159'))})
+    return data
+""",
+
+    'page_resident/helpers.py': """
+import re
+
+WORD_RE = re.compile(r'[a-z]+')
+
+
+def count_words(text):
+    return len(WORD_RE.findall(text))
+""",
+
+    'page_stream/index.py': """
+import cherrypy
+
+
+def stream_it():
+    for i in range(64):
+        yield bytes('line {i}\\n'.format(i=i), 'utf8')
+
+
+cherrypy.response.____ideapy_scope____['____ideapy____'].stream(stream_it)
+""",
+
+    'page_session/index.py': """
+import cherrypy
+
+if not 'counter' in cherrypy.session:
+    cherrypy.session['counter'] = 0
+
+cherrypy.session['counter'] += 1
+cherrypy.response.body = bytes(str(cherrypy.session['counter']), 'utf8')
+""",
+
+    'page_wsgi/index.py': """
+import cherrypy
+
+
+def application(environ, start_response):
+    if environ['PATH_INFO'] == '/echo':
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+        data = environ['wsgi.input'].read(length)
+        start_response('200 OK', [('Content-Type', 'application/octet-stream'), ('Content-Length', str(len(data)))])
+        return [data]
+
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'Hello World']
+
+
+cherrypy.response.____ideapy_scope____['____ideapy____'].run_wsgi_app(application)
+"""
+}
+
+
+def build_fixtures(root_dir:str, port:int, settings:dict = None):
+    """
+    create document root with all files required by SCENARIOS and ideapy.conf.json
+    """
+    static_dir = os.path.join(root_dir, 'static')
+    listing_dir = os.path.join(root_dir, 'listing')
+
+    os.makedirs(static_dir)
+    os.makedirs(listing_dir)
+
+    with open(os.path.join(static_dir, 'small.txt'), 'wb') as f:
+        f.write(b'a' * SMALL_FILE_SIZE)
+
+    with open(os.path.join(static_dir, 'large.bin'), 'wb') as f:
+        f.write(os.urandom(LARGE_FILE_SIZE))
+
+    for index in range(LISTING_ENTRIES):
+        with open(os.path.join(listing_dir, 'entry_{index:04d}.txt'.format(index=index)), 'w') as f:
+            f.write(str(index))
+
+    for pathname, source in FIXTURE_PAGES.items():
+        full_pathname = os.path.join(root_dir, pathname)
+        os.makedirs(os.path.dirname(full_pathname), exist_ok=True)
+
+        with open(full_pathname, 'w') as f:
+            f.write(source.lstrip())
+
+    conf = {
+        'DEBUG_MODE': False,
+        'RESIDENT_PAGES': True,
+        '_virtual_hosts': [{
+            'document_roots': ['/'],
+            'server_name': 'bench',
+            'server_aliases': ['localhost'],
+            'listen_ips': ['127.0.0.1'],
+            'listen_port': port,
+            'opt_indexes': True,
+            'wsgi_mounts': {'/mounted/': '/page_wsgi/index.py'}
+        }]
+    }
+    conf.update(settings or {})
+
+    with open(os.path.join(root_dir, 'ideapy.conf.json'), 'w') as f:
+        f.write(json.dumps(conf, indent=4, sort_keys=True))
+
+
+def find_free_port() -> int:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    return port
+
+
+def wait_for_port(port:int, timeout:float):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), 0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+
+    raise RuntimeError('IdeaPy did not start listening on port {port} in {timeout}s'.format(port=port, timeout=timeout))
+
+
+def read_rss_kb(pid:int) -> Dict[str, int]:
+    """
+    current (VmRSS) and peak (VmHWM) resident set size of the process, in kB
+    """
+    result = {'rss_kb': -1, 'peak_rss_kb': -1}
+
+    try:
+        with open('/proc/{pid}/status'.format(pid=pid)) as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    result['rss_kb'] = int(line.split()[1])
+                elif line.startswith('VmHWM:'):
+                    result['peak_rss_kb'] = int(line.split()[1])
+    except (OSError, ValueError): pass
+
+    return result
+
+
+def percentile(sorted_values:List[float], pct:float) -> float:
+    if not sorted_values:
+        return 0.0
+
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _client_thread(port:int, request:tuple, deadline:float, latencies:List[float], counters:Dict[str, int]):
+    method, path, headers, body = request
+    headers = dict(headers)
+    headers['Host'] = 'localhost:{port}'.format(port=port)
+    cookie = None
+    conn = None
+
+    while time.time() < deadline:
+        if conn is None:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+
+        if cookie:
+            headers['Cookie'] = cookie
+
+        started = time.perf_counter()
+        try:
+            conn.request(method, path, body, headers)
+            response = conn.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            counters['errors'] += 1
+            conn.close()
+            conn = None
+            continue
+
+        latencies.append(time.perf_counter() - started)
+
+        if response.status >= 400:
+            counters['errors'] += 1
+
+        set_cookie = response.getheader('Set-Cookie')
+        if set_cookie:
+            cookie = set_cookie.split(';', 1)[0]
+
+        if response.will_close:
+            conn.close()
+            conn = None
+
+    if conn is not None:
+        conn.close()
+
+
+def _client_process(port:int, request:tuple, duration:float, threads:int, queue:multiprocessing.Queue):
+    deadline = time.time() + duration
+    latencies = []
+    counters = {'errors': 0}
+
+    workers = [threading.Thread(target=_client_thread, args=(port, request, deadline, latencies, counters)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    queue.put({'latencies': latencies, 'errors': counters['errors']})
+
+
+def run_load(port:int, request:tuple, duration:float, concurrency:int, processes:int) -> dict:
+    """
+    drive one scenario with `concurrency` connections spread over `processes` client processes
+    """
+    processes = max(1, min(processes, concurrency))
+    queue = multiprocessing.Queue()
+    procs = []
+
+    for index in range(processes):
+        threads = concurrency // processes + (1 if index < concurrency % processes else 0)
+        proc = multiprocessing.Process(target=_client_process, args=(port, request, duration, threads, queue))
+        proc.start()
+        procs.append(proc)
+
+    latencies = []
+    errors = 0
+    for proc in procs:
+        part = queue.get()
+        latencies.extend(part['latencies'])
+        errors += part['errors']
+
+    for proc in procs:
+        proc.join()
+
+    latencies.sort()
+    total = len(latencies)
+
+    return {
+        'requests': total,
+        'errors': errors,
+        'rps': round(total / duration, 2),
+        'latency_ms': {
+            'mean': round(sum(latencies) / total * 1000, 3) if total else 0.0,
+            'p50': round(percentile(latencies, 50) * 1000, 3),
+            'p90': round(percentile(latencies, 90) * 1000, 3),
+            'p99': round(percentile(latencies, 99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3) if total else 0.0
+        }
+    }
+
+
+def compare_with_baseline(results:dict, baseline:dict, rps_threshold:float, latency_threshold:float, rss_threshold:float) -> List[str]:
+    """
+    return list of human readable regressions, empty when everything is within thresholds
+    """
+    regressions = []
+
+    for name, current in results['scenarios'].items():
+        if name not in baseline.get('scenarios', {}):
+            continue
+
+        base = baseline['scenarios'][name]
+
+        if base['rps'] and current['rps'] < base['rps'] * (1.0 - rps_threshold):
+            regressions.append('{name}: rps {current} < baseline {base}'.format(name=name, current=current['rps'], base=base['rps']))
+
+        base_p99 = base['latency_ms']['p99']
+        if base_p99 and current['latency_ms']['p99'] > base_p99 * (1.0 + latency_threshold):
+            regressions.append('{name}: p99 {current}ms > baseline {base}ms'.format(name=name, current=current['latency_ms']['p99'], base=base_p99))
+
+        if current['errors'] > base['errors']:
+            regressions.append('{name}: {current} errors, baseline {base}'.format(name=name, current=current['errors'], base=base['errors']))
+
+    base_rss = baseline.get('server', {}).get('peak_rss_kb', -1)
+    current_rss = results['server']['peak_rss_kb']
+    if base_rss > 0 and current_rss > base_rss * (1.0 + rss_threshold):
+        regressions.append('server: peak RSS {current}kB > baseline {base}kB'.format(current=current_rss, base=base_rss))
+
+    return regressions
+
+
+def print_table(results:dict, baseline:Optional[dict]):
+    line = '{name:<20} {rps:>10} {p50:>9} {p90:>9} {p99:>9} {errors:>7} {rss:>10} {base_rps:>10}'
+    print(line.format(name='scenario', rps='rps', p50='p50 ms', p90='p90 ms', p99='p99 ms', errors='errors', rss='rss kB', base_rps='base rps'))
+
+    for name, data in results['scenarios'].items():
+        base_rps = '-'
+        if baseline and name in baseline.get('scenarios', {}):
+            base_rps = baseline['scenarios'][name]['rps']
+
+        print(line.format(
+            name = name,
+            rps = data['rps'],
+            p50 = data['latency_ms']['p50'],
+            p90 = data['latency_ms']['p90'],
+            p99 = data['latency_ms']['p99'],
+            errors = data['errors'],
+            rss = data['rss_kb'],
+            base_rps = base_rps
+        ))
+
+
+def parse_args(argv:List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='End-to-end HTTP benchmark for IdeaPy')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per scenario')
+    parser.add_argument('--warmup', type=float, default=1.0, help='warm-up seconds per scenario (not measured)')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent connections')
+    parser.add_argument('--processes', type=int, default=min(4, os.cpu_count() or 1), help='load generator processes')
+    parser.add_argument('--scenarios', default='', help='comma separated scenario names (default: all)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='JSON result file')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='stored baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='store results as the new baseline')
+    parser.add_argument('--rps-threshold', type=float, default=0.10, help='allowed relative RPS drop')
+    parser.add_argument('--latency-threshold', type=float, default=0.25, help='allowed relative p99 increase')
+    parser.add_argument('--rss-threshold', type=float, default=0.25, help='allowed relative peak RSS increase')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=JSON', help='ideapy.conf.json setting, e.g. STATIC_FRONTEND=true')
+    parser.add_argument('--keep-fixtures', action='store_true', help='do not remove the fixture directory')
+
+    return parser.parse_args(argv)
+
+
+def main(argv:List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+
+    selected = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    scenarios = [(name, request) for name, request in SCENARIOS if not selected or name in selected]
+    assert scenarios, 'no scenarios selected'
+
+    fixture_dir = tempfile.mkdtemp(prefix='ideapy_bench_')
+    port = find_free_port()
+    build_fixtures(fixture_dir, port, {name: json.loads(value) for name, sep, value in (setting.partition('=') for setting in args.set)})
+
+    server_log = open(os.path.join(fixture_dir, 'server.log'), 'w')
+    server = subprocess.Popen([sys.executable, IDEAPY_PATHNAME], cwd=fixture_dir, stdout=server_log, stderr=subprocess.STDOUT)
+
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'duration': args.duration,
+            'concurrency': args.concurrency,
+            'processes': args.processes,
+            'settings': args.set
+        },
+        'server': {},
+        'scenarios': OrderedDict()
+    }
+
+    try:
+        wait_for_port(port, 30)
+        results['server']['start_rss_kb'] = read_rss_kb(server.pid)['rss_kb']
+
+        for name, request in scenarios:
+            if args.warmup > 0:
+                run_load(port, request, args.warmup, args.concurrency, args.processes)
+
+            data = run_load(port, request, args.duration, args.concurrency, args.processes)
+            data['rss_kb'] = read_rss_kb(server.pid)['rss_kb']
+            results['scenarios'][name] = data
+
+        results['server'].update(read_rss_kb(server.pid))
+    finally:
+        server.terminate()
+        try:
+            server.wait(10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+        server_log.close()
+
+        if args.keep_fixtures:
+            print('fixtures kept in', fixture_dir)
+        else:
+            shutil.rmtree(fixture_dir, ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        f.write(json.dumps(results, indent=4))
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.loads(f.read())
+
+    print_table(results, baseline)
+    print('results written to', args.output)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            f.write(json.dumps(results, indent=4))
+
+        print('baseline saved to', args.baseline)
+        return 0
+
+    if baseline is None:
+        print('no baseline found at', args.baseline, '- skipping comparison')
+        return 0
+
+    regressions = compare_with_baseline(results, baseline, args.rps_threshold, args.latency_threshold, args.rss_threshold)
+    for regression in regressions:
+        print('REGRESSION', regression)
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Microbenchmarks for IdeaPy hot helpers and in-process dispatch.
+
+Groups:
+- helpers   _clean_path, _locate_file, _build_scope, _parse_http_Range
+- dispatch  in-process requests (full CherryPy pipeline and IdeaPy.default() only),
+            static files and Python pages, no sockets involved
+- vhosts    scaling curve 1 -> 10k virtual hosts: startup, _find_virtual_host_by_netloc,
+            _virtual_hosts_to_dict, default()
+- files     scaling curve 1 -> 100k files per directory: _locate_file, directory listing
+- routing   per request dispatch overhead 1 -> 10k virtual hosts: CherryPy's VirtualHost dispatcher
+            with the lookup in default() against the FAST_DISPATCH table, and full requests with both
+
+Example usage:
+$ python3 benchmarks/bench_micro.py
+$ python3 benchmarks/bench_micro.py --groups helpers,dispatch
+$ python3 benchmarks/bench_micro.py --max-vhosts 1000 --max-files 10000
+$ python3 benchmarks/bench_micro.py --groups routing
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import timeit
+import argparse
+import tempfile
+
+from urllib.parse import urlparse
+from typing import List, Callable
+
+BENCH_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, os.path.realpath(os.path.join(BENCH_DIR, '..')))
+
+import cherrypy
+
+from ideapy import IdeaPy
+from inprocess import InProcessDispatcher
+from bench_http import build_fixtures
+
+
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'micro_results.json')
+VHOSTS_STEPS = [1, 10, 100, 1000, 10000]
+FILES_STEPS = [1, 10, 100, 1000, 10000, 100000]
+PORT = 8080
+
+
+class MicroBench:
+    def __init__(self, repeat:int, min_time:float):
+        self._repeat = repeat
+        self._min_time = min_time
+        self.results = []
+
+
+    def run(self, group:str, name:str, func:Callable, param:int = None) -> dict:
+        timer = timeit.Timer(func)
+
+        number = 1
+        while True:
+            elapsed = timer.timeit(number)
+            if elapsed >= self._min_time or number >= 10 ** 7:
+                break
+            number *= 10
+
+        best = min([elapsed] + timer.repeat(self._repeat - 1, number)) if self._repeat > 1 else elapsed
+        ns_per_op = best / number * 1e9
+
+        result = {
+            'group': group,
+            'name': name,
+            'param': param,
+            'ns_per_op': round(ns_per_op, 1),
+            'ops_per_sec': round(1e9 / ns_per_op, 1) if ns_per_op else 0.0
+        }
+        self.results.append(result)
+
+        print('{group:<9} {name:<40} {param:>8} {ns:>16} ns/op {ops:>14} ops/s'.format(
+            group = group,
+            name = name,
+            param = '' if param is None else param,
+            ns = result['ns_per_op'],
+            ops = result['ops_per_sec']
+        ))
+
+        return result
+
+
+def make_idea(root_dir:str, vhosts_count:int) -> IdeaPy:
+    """
+    write ideapy.conf.json with vhosts_count virtual hosts into root_dir and construct IdeaPy there
+    """
+    virtual_hosts = []
+    for index in range(vhosts_count):
+        virtual_hosts.append({
+            'document_roots': ['/'],
+            'server_name': 'host{index}'.format(index=index),
+            'server_aliases': ['localhost'] if index == vhosts_count - 1 else ['alias{index}'.format(index=index)],
+            'listen_ips': ['127.0.0.1'],
+            'listen_port': PORT,
+            'opt_indexes': True
+        })
+
+    with open(os.path.join(root_dir, 'ideapy.conf.json'), 'w') as f:
+        f.write(json.dumps({'_virtual_hosts': virtual_hosts}))
+
+    os.chdir(root_dir)
+    return IdeaPy()
+
+
+def setup_serving(path:str = '/', headers:dict = None):
+    """
+    fake request/response for helpers that touch cherrypy.request or cherrypy.response
+    """
+    request = cherrypy._cprequest.Request(cherrypy.lib.httputil.Host('127.0.0.1', PORT, ''), cherrypy.lib.httputil.Host('127.0.0.1', 50000, ''))
+    request.headers = cherrypy.lib.httputil.HeaderMap(headers or {})
+    request.path_info = path
+    cherrypy.serving.load(request, cherrypy._cprequest.Response())
+
+
+def bench_helpers(bench:MicroBench, fixture_dir:str):
+    idea = make_idea(fixture_dir, 1)
+    virtual_host = list(idea._virtual_hosts.values())[0]
+    page_pathname = os.path.join(fixture_dir, 'page_simple', 'index.py')
+
+    bench.run('helpers', '_clean_path clean', lambda: idea._clean_path('/var/www/site/static/app.js'))
+    bench.run('helpers', '_clean_path dirty', lambda: idea._clean_path('//var////www//site///static//app.js'))
+    bench.run('helpers', '_locate_file hit', lambda: idea._locate_file('/static/small.txt', virtual_host))
+    bench.run('helpers', '_locate_file miss', lambda: idea._locate_file('/static/missing.txt', virtual_host))
+    bench.run('helpers', '_locate_file dir', lambda: idea._locate_file('/listing/', virtual_host))
+
+    idea._build_scope('/page_simple/index.py', page_pathname)
+    bench.run('helpers', '_build_scope cached', lambda: idea._build_scope('/page_simple/index.py', page_pathname))
+
+    def build_scope_miss():
+        idea._cached_scopes.clear()
+        idea._build_scope('/page_simple/index.py', page_pathname)
+
+    bench.run('helpers', '_build_scope miss', build_scope_miss)
+
+    setup_serving('/static/large.bin', {'Range': 'bytes=1024-65535'})
+    bench.run('helpers', '_parse_http_Range start-end', idea._parse_http_Range)
+
+    setup_serving('/static/large.bin', {'Range': 'bytes=1024-'})
+    bench.run('helpers', '_parse_http_Range start', idea._parse_http_Range)
+
+
+def bench_dispatch(bench:MicroBench, fixture_dir:str):
+    idea = make_idea(fixture_dir, 1)
+    dispatcher = InProcessDispatcher(idea, port=PORT)
+
+    for url in ['/static/small.txt', '/page_simple/', '/page_imports/', '/page_stream/', '/listing/', '/page_wsgi/?q=/hello']:
+        status, headers, body = dispatcher.request('GET', url)
+        assert status.startswith('200'), '{url} returned {status}'.format(url=url, status=status)
+
+        bench.run('dispatch', 'request ' + url, lambda: dispatcher.request('GET', url))
+        bench.run('dispatch', 'call_default ' + url, lambda: dispatcher.call_default(url))
+
+
+def bench_vhosts(bench:MicroBench, fixture_dir:str, max_vhosts:int):
+    for count in [step for step in VHOSTS_STEPS if step <= max_vhosts]:
+        started = time.perf_counter()
+        idea = make_idea(fixture_dir, count)
+        elapsed = time.perf_counter() - started
+
+        bench.results.append({'group': 'vhosts', 'name': 'IdeaPy() startup', 'param': count, 'ns_per_op': round(elapsed * 1e9, 1), 'ops_per_sec': round(1 / elapsed, 3)})
+        print('{group:<9} {name:<40} {param:>8} {ms:>16} ms'.format(group='vhosts', name='IdeaPy() startup', param=count, ms=round(elapsed * 1000, 3)))
+
+        #last registered virtual host is the worst case for a linear scan
+        bench.run('vhosts', '_find_virtual_host_by_netloc last', lambda: idea._find_virtual_host_by_netloc('localhost:{port}'.format(port=PORT), PORT), count)
+        bench.run('vhosts', '_find_virtual_host_by_netloc miss', lambda: idea._find_virtual_host_by_netloc('unknown:{port}'.format(port=PORT), PORT), count)
+        bench.run('vhosts', '_virtual_hosts_to_dict', idea._virtual_hosts_to_dict, count)
+
+        dispatcher = InProcessDispatcher(idea, port=PORT)
+        bench.run('vhosts', 'call_default /static/small.txt', lambda: dispatcher.call_default('/static/small.txt'), count)
+
+        os.remove(os.path.join(fixture_dir, 'ideapy.conf.json'))
+
+
+def bench_files(bench:MicroBench, fixture_dir:str, max_files:int):
+    idea = make_idea(fixture_dir, 1)
+    virtual_host = list(idea._virtual_hosts.values())[0]
+    virtual_host['index_ignore'] = []
+    created = 0
+
+    files_dir = os.path.join(fixture_dir, 'files')
+    os.makedirs(files_dir)
+
+    for count in [step for step in FILES_STEPS if step <= max_files]:
+        while created < count:
+            open(os.path.join(files_dir, 'file_{index:06d}.txt'.format(index=created)), 'w').close()
+            created += 1
+
+        setup_serving('/files/')
+        bench.run('files', '_locate_file hit', lambda: idea._locate_file('/files/file_000000.txt', virtual_host), count)
+        bench.run('files', '_render_directory_listing', lambda: idea._render_directory_listing(virtual_host, files_dir, '/files/'), count)
+
+
+def bench_routing(bench:MicroBench, fixture_dir:str, max_vhosts:int):
+    def setup_routing(app):
+        #worst case for the linear scan in default(), the last registered virtual host
+        setup_serving('/static/small.txt', {'Host': 'localhost:{port}'.format(port=PORT)})
+        cherrypy.serving.request.app = app
+        cherrypy.serving.request.base = 'http://localhost:{port}'.format(port=PORT)
+
+    for count in [step for step in VHOSTS_STEPS if step <= max_vhosts]:
+        IdeaPy.FAST_DISPATCH = False
+        idea = make_idea(fixture_dir, count)
+        dispatcher = InProcessDispatcher(idea, port=PORT)
+        vhost_dispatch = dispatcher._app.config[idea._virtual_host_root]['request.dispatch']
+
+        def cherrypy_dispatch():
+            vhost_dispatch('/static/small.txt')
+            parsed_url = urlparse(cherrypy.serving.request.base)
+            idea._find_virtual_host_by_netloc(parsed_url.netloc, parsed_url.port or PORT)
+
+        setup_routing(dispatcher._app)
+        bench.run('routing', 'VirtualHost + default() lookup', cherrypy_dispatch, count)
+        bench.run('routing', 'request FAST_DISPATCH off', lambda: dispatcher.request('GET', '/static/small.txt'), count)
+
+        IdeaPy.FAST_DISPATCH = True
+        idea._mount_virtual_hosts()
+
+        setup_routing(dispatcher._app)
+        bench.run('routing', '_dispatch', lambda: idea._dispatch('/static/small.txt'), count)
+        bench.run('routing', 'request FAST_DISPATCH on', lambda: dispatcher.request('GET', '/static/small.txt'), count)
+
+        os.remove(os.path.join(fixture_dir, 'ideapy.conf.json'))
+
+
+def parse_args(argv:List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='IdeaPy microbenchmarks')
+    parser.add_argument('--groups', default='helpers,dispatch,vhosts,files,routing', help='comma separated groups')
+    parser.add_argument('--repeat', type=int, default=3, help='repeats per benchmark, best is reported')
+    parser.add_argument('--min-time', type=float, default=0.2, help='minimal seconds per repeat')
+    parser.add_argument('--max-vhosts', type=int, default=VHOSTS_STEPS[-1], help='largest virtual hosts count')
+    parser.add_argument('--max-files', type=int, default=FILES_STEPS[-1], help='largest files per directory count')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='JSON result file')
+
+    return parser.parse_args(argv)
+
+
+def main(argv:List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    groups = [group.strip() for group in args.groups.split(',') if group.strip()]
+
+    IdeaPy.setup_cherrypy()
+    cherrypy.config.update({'log.screen': False})
+
+    bench = MicroBench(args.repeat, args.min_time)
+    org_cwd = os.getcwd()
+    fixture_dir = tempfile.mkdtemp(prefix='ideapy_micro_')
+
+    try:
+        build_fixtures(fixture_dir, PORT)
+
+        if 'helpers' in groups:
+            bench_helpers(bench, fixture_dir)
+        if 'dispatch' in groups:
+            bench_dispatch(bench, fixture_dir)
+        if 'vhosts' in groups:
+            bench_vhosts(bench, fixture_dir, args.max_vhosts)
+        if 'files' in groups:
+            bench_files(bench, fixture_dir, args.max_files)
+        if 'routing' in groups:
+            bench_routing(bench, fixture_dir, args.max_vhosts)
+    finally:
+        os.chdir(org_cwd)
+        shutil.rmtree(fixture_dir, ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        f.write(json.dumps(bench.results, indent=4))
+
+    print('results written to', args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Startup time of IdeaPy: `import ideapy` and IdeaPy() with 1 -> 10k virtual hosts.
+
+Every measurement runs in a fresh interpreter. The import part is the -X importtime
+report of `import ideapy`, summarized (total, ideapy itself, CherryPy, slowest modules).
+IdeaPy() is measured with an ideapy.conf.json of N virtual hosts, the median of --repeat runs
+is reported and compared with --target-ms for --target-vhosts virtual hosts.
+
+Example usage:
+$ python3 benchmarks/bench_startup.py
+$ python3 benchmarks/bench_startup.py --vhosts 1000 --repeat 5 --top 20
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+from typing import List
+
+BENCH_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.realpath(os.path.join(BENCH_DIR, '..'))
+
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'startup_results.json')
+VHOSTS_STEPS = [1, 100, 1000, 10000]
+
+INIT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root_dir!r})
+
+import cherrypy
+import ideapy
+
+cherrypy.config.update({{'log.screen': False}})
+
+started = time.perf_counter()
+ideapy.IdeaPy()
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def importtime_report(top:int) -> dict:
+    """
+    run `python -X importtime -c "import ideapy"` and summarize it, times are in milliseconds
+    """
+    output = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ideapy'],
+        cwd=ROOT_DIR, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, universal_newlines=True, check=True
+    ).stderr
+
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append({
+            'name': name.strip(),
+            'depth': (len(name) - len(name.lstrip())) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000
+        })
+
+    by_name = {module['name']: module for module in modules if module['depth'] <= 1}
+
+    return {
+        'total_ms': round(sum(module['self_ms'] for module in modules), 3),
+        'ideapy_self_ms': by_name['ideapy']['self_ms'] if 'ideapy' in by_name else None,
+        'cherrypy_ms': by_name['cherrypy']['cumulative_ms'] if 'cherrypy' in by_name else None,
+        'modules': len(modules),
+        'slowest': sorted(modules, key=lambda module: module['self_ms'], reverse=True)[:top]
+    }
+
+
+def write_conf(root_dir:str, vhosts_count:int):
+    virtual_hosts = []
+    for index in range(vhosts_count):
+        virtual_hosts.append({
+            'document_roots': ['/'],
+            'server_name': 'host{index}'.format(index=index),
+            'server_aliases': ['alias{index}'.format(index=index)],
+            'listen_ips': ['127.0.0.1'],
+            'listen_port': 8080
+        })
+
+    with open(os.path.join(root_dir, 'ideapy.conf.json'), 'w') as f:
+        f.write(json.dumps({'_virtual_hosts': virtual_hosts}))
+
+
+def init_time_ms(vhosts_count:int, repeat:int) -> dict:
+    fixture_dir = tempfile.mkdtemp(prefix='ideapy_startup_')
+
+    try:
+        write_conf(fixture_dir, vhosts_count)
+
+        times = []
+        for i in range(repeat):
+            output = subprocess.run(
+                [sys.executable, '-c', INIT_SNIPPET.format(root_dir=ROOT_DIR)],
+                cwd=fixture_dir, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True, check=True
+            ).stdout
+
+            times.append(float(output.strip().splitlines()[-1]))
+    finally:
+        shutil.rmtree(fixture_dir, ignore_errors=True)
+
+    return {
+        'vhosts': vhosts_count,
+        'median_ms': round(statistics.median(times), 3),
+        'min_ms': round(min(times), 3),
+        'max_ms': round(max(times), 3)
+    }
+
+
+def parse_args(argv:List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='IdeaPy startup time')
+    parser.add_argument('--vhosts', default=','.join(str(step) for step in VHOSTS_STEPS), help='comma separated virtual hosts counts')
+    parser.add_argument('--repeat', type=int, default=3, help='fresh interpreters per measurement, median is reported')
+    parser.add_argument('--top', type=int, default=15, help='slowest imported modules to show')
+    parser.add_argument('--target-vhosts', type=int, default=1000, help='virtual hosts count the target applies to')
+    parser.add_argument('--target-ms', type=float, default=100.0, help='IdeaPy() time target in milliseconds, 0 disables the check')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='JSON result file')
+
+    return parser.parse_args(argv)
+
+
+def main(argv:List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    results = {'import': importtime_report(args.top), 'init': []}
+
+    print('import ideapy: {total} ms total, ideapy itself {own} ms, cherrypy {cherrypy} ms, {count} modules'.format(
+        total = results['import']['total_ms'],
+        own = results['import']['ideapy_self_ms'],
+        cherrypy = results['import']['cherrypy_ms'],
+        count = results['import']['modules']
+    ))
+
+    if os.environ.get('PYTHONDONTWRITEBYTECODE'):
+        print('PYTHONDONTWRITEBYTECODE is set, import times include compiling ideapy.py')
+
+    print('{self:>10} {cumulative:>10}  module'.format(self='self ms', cumulative='cumul. ms'))
+    for module in results['import']['slowest']:
+        print('{self:>10.3f} {cumulative:>10.3f}  {name}'.format(self=module['self_ms'], cumulative=module['cumulative_ms'], name=module['name']))
+
+    exit_code = 0
+    for count in [int(step) for step in args.vhosts.split(',') if step.strip()]:
+        result = init_time_ms(count, args.repeat)
+        results['init'].append(result)
+
+        status = ''
+        if args.target_ms and count == args.target_vhosts:
+            status = 'OK' if result['median_ms'] <= args.target_ms else 'OVER TARGET {target} ms'.format(target=args.target_ms)
+            if result['median_ms'] > args.target_ms:
+                exit_code = 1
+
+        print('IdeaPy() {count:>6} vhost(s) {median:>10.3f} ms (min {min:.3f}, max {max:.3f}) {status}'.format(
+            count = count,
+            median = result['median_ms'],
+            min = result['min_ms'],
+            max = result['max_ms'],
+            status = status
+        ))
+
+    with open(args.output, 'w') as f:
+        f.write(json.dumps(results, indent=4))
+
+    print('results written to', args.output)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
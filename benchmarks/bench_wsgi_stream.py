@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Large upload/download through run_wsgi_app, using examples/wsgi/flask (requires Flask).
+
+Starts IdeaPy on loopback with the Flask example page, uploads and downloads
+--size-mb megabytes (1 GB by default) and reports throughput and server RSS,
+which should stay flat when the WSGI bridge streams both directions.
+
+Example usage:
+$ python3 benchmarks/bench_wsgi_stream.py
+$ python3 benchmarks/bench_wsgi_stream.py --size-mb 256
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+
+from typing import List
+
+BENCH_DIR = os.path.dirname(os.path.realpath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from bench_http import IDEAPY_PATHNAME, find_free_port, wait_for_port, read_rss_kb
+
+
+EXAMPLE_PATHNAME = os.path.realpath(os.path.join(BENCH_DIR, '..', 'examples', 'wsgi', 'flask', 'index.py'))
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'wsgi_stream_results.json')
+CHUNK_SIZE = 1024 * 1024
+
+
+class RSSSampler(threading.Thread):
+    """
+    samples VmRSS of the server while a transfer is running, keeps the maximum
+    """
+    def __init__(self, pid:int):
+        super().__init__(daemon=True)
+        self._pid = pid
+        self._running = True
+        self.max_rss_kb = 0
+
+
+    def run(self):
+        while self._running:
+            self.max_rss_kb = max(self.max_rss_kb, read_rss_kb(self._pid)['rss_kb'])
+            time.sleep(0.05)
+
+
+    def stop(self) -> int:
+        self._running = False
+        self.join()
+
+        return self.max_rss_kb
+
+
+def upload(port:int, size:int) -> dict:
+    def body():
+        chunk = b'1' * CHUNK_SIZE
+        left = size
+        while left > 0:
+            yield chunk[:left]
+            left -= CHUNK_SIZE
+
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=600)
+    started = time.perf_counter()
+
+    conn.request('POST', '/flask/?q=/upload', body(), {
+        'Host': 'localhost:{port}'.format(port=port),
+        'Content-Type': 'application/octet-stream',
+        'Content-Length': str(size)
+    })
+    response = conn.getresponse()
+    received = response.read()
+    elapsed = time.perf_counter() - started
+    conn.close()
+
+    assert response.status == 200, 'upload failed with {status} {body}'.format(status=response.status, body=received[:200])
+    assert int(received) == size, 'server received {received} bytes instead of {size}'.format(received=received, size=size)
+
+    return {'seconds': round(elapsed, 3), 'mb_per_sec': round(size / CHUNK_SIZE / elapsed, 2)}
+
+
+def download(port:int, size:int) -> dict:
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=600)
+    started = time.perf_counter()
+
+    conn.request('GET', '/flask/?q=/download?size={size}'.format(size=size), headers={'Host': 'localhost:{port}'.format(port=port)})
+    response = conn.getresponse()
+
+    received = 0
+    while True:
+        data = response.read(CHUNK_SIZE)
+        if not data:
+            break
+        received += len(data)
+
+    elapsed = time.perf_counter() - started
+    conn.close()
+
+    assert response.status == 200, 'download failed with {status}'.format(status=response.status)
+    assert received == size, 'client received {received} bytes instead of {size}'.format(received=received, size=size)
+
+    return {'seconds': round(elapsed, 3), 'mb_per_sec': round(size / CHUNK_SIZE / elapsed, 2)}
+
+
+def parse_args(argv:List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Large upload/download through run_wsgi_app')
+    parser.add_argument('--size-mb', type=int, default=1024, help='transfer size in megabytes')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='JSON result file')
+
+    return parser.parse_args(argv)
+
+
+def main(argv:List[str] = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    size = args.size_mb * CHUNK_SIZE
+
+    fixture_dir = tempfile.mkdtemp(prefix='ideapy_wsgi_stream_')
+    port = find_free_port()
+
+    os.makedirs(os.path.join(fixture_dir, 'flask'))
+    shutil.copy(EXAMPLE_PATHNAME, os.path.join(fixture_dir, 'flask', 'index.py'))
+
+    with open(os.path.join(fixture_dir, 'ideapy.conf.json'), 'w') as f:
+        f.write(json.dumps({
+            'MAX_REQUEST_BODY_SIZE': 0,
+            '_virtual_hosts': [{
+                'document_roots': ['/'],
+                'server_name': 'bench',
+                'server_aliases': ['localhost'],
+                'listen_ips': ['127.0.0.1'],
+                'listen_port': port
+            }]
+        }))
+
+    server_log = open(os.path.join(fixture_dir, 'server.log'), 'w')
+    server = subprocess.Popen([sys.executable, IDEAPY_PATHNAME], cwd=fixture_dir, stdout=server_log, stderr=subprocess.STDOUT)
+
+    results = {'size_mb': args.size_mb}
+
+    try:
+        wait_for_port(port, 30)
+
+        #warm up Flask imports
+        download(port, CHUNK_SIZE)
+        results['start_rss_kb'] = read_rss_kb(server.pid)['rss_kb']
+
+        for name, func in [('upload', upload), ('download', download)]:
+            sampler = RSSSampler(server.pid)
+            sampler.start()
+
+            try:
+                results[name] = func(port, size)
+            finally:
+                results[name + '_max_rss_kb'] = sampler.stop()
+
+            print('{name:<9} {mb} MB in {seconds}s, {speed} MB/s, server max RSS {rss} kB'.format(
+                name = name,
+                mb = args.size_mb,
+                seconds = results[name]['seconds'],
+                speed = results[name]['mb_per_sec'],
+                rss = results[name + '_max_rss_kb']
+            ))
+    finally:
+        server.terminate()
+        try:
+            server.wait(10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+        server_log.close()
+        shutil.rmtree(fixture_dir, ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        f.write(json.dumps(results, indent=4))
+
+    print('server RSS at start {rss} kB'.format(rss=results['start_rss_kb']))
+    print('results written to', args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+
+"""
+In-process request dispatcher for IdeaPy.
+
+Pushes synthetic requests through an IdeaPy instance without sockets, so
+page execution and dispatch overhead can be measured apart from network I/O.
+
+Two entry points are available:
+- request() runs the full CherryPy pipeline (tools, VirtualHost dispatcher,
+  sessions) like a real HTTP request, just without the HTTP server
+- call_default() calls IdeaPy.default() directly with a minimal request,
+  which is the IdeaPy-only cost of serving a path
+
+Example usage:
+    idea = IdeaPy()
+    dispatcher = InProcessDispatcher(idea, port=8080)
+    status, headers, body = dispatcher.request('GET', '/examples/default_page/')
+"""
+
+import os
+import io
+import sys
+
+sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')))
+
+import cherrypy
+
+from cherrypy.lib import httputil
+from cherrypy.lib.sessions import RamSession
+from typing import List, Tuple, Dict
+
+
+class InProcessDispatcher:
+    def __init__(self, idea, host:str = 'localhost', port:int = 8080):
+        self._idea = idea
+        self._host = host
+        self._port = port
+
+        idea._mount_virtual_hosts()
+        idea._collect_builtin_modules()
+        idea._install_own_importer()
+
+        self._app = cherrypy.tree.apps[idea._virtual_host_root.rstrip('/')]
+        self._local = httputil.Host('127.0.0.1', port, '')
+        self._remote = httputil.Host('127.0.0.1', 50000, '')
+
+
+    def _build_environ(self, method:str, path:str, query_string:str, headers:List[Tuple[str, str]], body:bytes) -> dict:
+        environ = {
+            'REQUEST_METHOD': method,
+            'SCRIPT_NAME': '',
+            'PATH_INFO': path,
+            'QUERY_STRING': query_string,
+            'REQUEST_URI': path + ('?' + query_string if query_string else ''),
+            'SERVER_NAME': self._host,
+            'SERVER_PORT': str(self._port),
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': self._remote.ip,
+            'REMOTE_PORT': str(self._remote.port),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False
+        }
+
+        for name, value in headers:
+            key = name.upper().replace('-', '_')
+            if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                key = 'HTTP_' + key
+
+            environ[key] = value
+
+        return environ
+
+
+    def _build_headers(self, headers:Dict[str, str], body:bytes) -> List[Tuple[str, str]]:
+        header_list = [('Host', '{host}:{port}'.format(host=self._host, port=self._port))]
+
+        if body:
+            header_list.append(('Content-Length', str(len(body))))
+
+        for name, value in (headers or {}).items():
+            header_list.append((name, value))
+
+        return header_list
+
+
+    def request(self, method:str, url:str, headers:Dict[str, str] = None, body:bytes = b'') -> Tuple[str, list, bytes]:
+        """
+        run request through the whole CherryPy pipeline, return (status, header_list, body)
+        """
+        path, _, query_string = url.partition('?')
+        header_list = self._build_headers(headers, body)
+
+        request, response = self._app.get_serving(self._local, self._remote, 'http', 'HTTP/1.1')
+        try:
+            request.wsgi_environ = self._build_environ(method, path, query_string, header_list, body)
+
+            response = request.run(method, path, query_string, 'HTTP/1.1', header_list, io.BytesIO(body))
+            output = b''.join(response.body)
+
+            return response.output_status.decode('ISO-8859-1'), response.header_list, output
+        finally:
+            self._app.release_serving()
+
+
+    def call_default(self, url:str, headers:Dict[str, str] = None, body:bytes = b'', method:str = 'GET'):
+        """
+        call IdeaPy.default() directly, skipping CherryPy tools and dispatchers, return handler's result
+        """
+        path, _, query_string = url.partition('?')
+        header_list = self._build_headers(headers, body)
+
+        request = cherrypy._cprequest.Request(self._local, self._remote, 'http', 'HTTP/1.1')
+        response = cherrypy._cprequest.Response()
+        cherrypy.serving.load(request, response)
+
+        request.app = self._app
+        request.hooks = request.__class__.hooks.copy()
+        request.method = method
+        request.path_info = path
+        request.query_string = query_string
+        request.base = 'http://{host}:{port}'.format(host=self._host, port=self._port)
+        request.headers = httputil.HeaderMap(header_list)
+        request.wsgi_environ = self._build_environ(method, path, query_string, header_list, body)
+        request.rfile = io.BytesIO(body)
+        request.body = cherrypy._cpreqbody.RequestBody(request.rfile, request.headers, request_params=request.params)
+
+        session = RamSession()
+        cherrypy.serving.session = session
+
+        try:
+            result = self._idea.default(*[part for part in path.split('/') if part])
+
+            if cherrypy.response.stream and result is not None and not isinstance(result, (bytes, str)):
+                result = b''.join(result)
+
+            return result
+        finally:
+            if session.locked:
+                session.release_lock()
+
+            request.hooks.run('on_end_request')
+            cherrypy.serving.clear()
@@ -0,0 +1,33 @@
+import asyncio
+import cherrypy
+
+
+# http://localhost:8080/examples/asgi/?q=/hello
+# http://localhost:8080/examples/asgi/?q=/count
+
+
+async def application(scope, receive, send):
+    if scope['path'] == '/count':
+        #streamed response
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', b'text/plain')]
+        })
+
+        for i in range(5):
+            await asyncio.sleep(0.2)
+            await send({'type': 'http.response.body', 'body': bytes(str(i) + '\n', 'utf8'), 'more_body': True})
+
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', b'text/plain')]
+    })
+    await send({'type': 'http.response.body', 'body': b'Hello World from ASGI'})
+
+
+cherrypy.response.____ideapy_scope____['____ideapy____'].run_asgi_app(application)
@@ -0,0 +1,25 @@
+import asyncio
+
+
+# http://localhost:8080/examples/async_page
+# (needs "RESIDENT_PAGES": true in ideapy.conf.json)
+
+
+# async handler runs on IdeaPy's shared event loop, so awaits of many
+# requests (HTTP calls, DB queries) overlap; cherrypy.request and
+# cherrypy.response are thread locals, use the arguments instead
+
+
+async def query(number):
+    #simulate slow I/O
+    await asyncio.sleep(0.5)
+    return number * number
+
+
+async def handle(request, response):
+    response.headers['Content-Type'] = 'text/plain'
+
+    #ten queries at once, ~0.5s in total
+    results = await asyncio.gather(*[query(i) for i in range(10)])
+
+    return 'results: {results}'.format(results = results)
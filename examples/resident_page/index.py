@@ -0,0 +1,30 @@
+import re
+import time
+import cherrypy
+
+
+# http://localhost:8080/examples/resident_page
+# (needs "RESIDENT_PAGES": true in ideapy.conf.json)
+
+
+# module level code is executed only once (and again when this file changes),
+# so put DB clients, compiled regexes, templates etc. here
+WORD_RE = re.compile(r'\w+')
+LOADED_AT = time.time()
+
+hits = 0
+
+
+# when page defines handle(request), IdeaPy keeps the page in memory
+# and calls just this function for every request
+def handle(request):
+    global hits
+    hits += 1
+
+    words = len(WORD_RE.findall(request.query_string))
+
+    return 'loaded at {loaded_at}, {hits} hit(s), {words} word(s) in query string'.format(
+        loaded_at = LOADED_AT,
+        hits = hits,
+        words = words
+    )
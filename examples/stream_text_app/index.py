@@ -1,4 +1,4 @@
-import time
+import asyncio
 import cherrypy
 import random
 
@@ -9,12 +9,13 @@ from this import s
 # http://localhost:8080/examples/stream_text_app
 
 
-#will stream The Zen of Python
-def stream_it():
+#will stream The Zen of Python, an async generator runs on IdeaPy's
+#event loop and with STREAM_OFFLOAD holds no thread while it sleeps
+async def stream_it():
     zen = decode(s, 'rot13')
 
     for line in zen.split('\n'):
-        time.sleep(random.randint(1, 3))
+        await asyncio.sleep(random.randint(1, 3))
         yield bytes(line + '\n', 'utf8')
 
 
@@ -1,8 +1,10 @@
 import cherrypy
-from flask import Flask
+from flask import Flask, Response, request
 
 
 # http://localhost:8080/examples/wsgi/flask/?q=/hello
+# http://localhost:8080/examples/wsgi/flask/?q=/download?size=1048576
+# curl -T file http://localhost:8080/examples/wsgi/flask/?q=/upload
 
 
 app = Flask('test_app')
@@ -12,4 +14,31 @@ def hello():
     return "Hello World"
 
 
+@app.route("/upload", methods=['POST', 'PUT'])
+def upload():
+    #request body is streamed from the socket, never kept in memory
+    total = 0
+    while True:
+        chunk = request.stream.read(1024 * 1024)
+        if not chunk:
+            break
+        total += len(chunk)
+
+    return str(total)
+
+
+@app.route("/download")
+def download():
+    size = int(request.args.get('size', 1024 * 1024))
+    chunk = b'0' * (1024 * 1024)
+
+    def generate():
+        left = size
+        while left > 0:
+            yield chunk[:left]
+            left -= len(chunk)
+
+    return Response(generate(), mimetype='application/octet-stream', headers={'Content-Length': str(size)})
+
+
 cherrypy.response.____ideapy_scope____['____ideapy____'].run_wsgi_app(app)
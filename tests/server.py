@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""
+IdeaPy started in its own process on loopback for end-to-end tests, with a document root
+and an ideapy.conf.json of one virtual host (server name "test") made for the test
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import tempfile
+import subprocess
+import http.client
+
+from typing import Dict, Tuple
+
+TESTS_DIR = os.path.dirname(os.path.realpath(__file__))
+ROOT_DIR = os.path.realpath(os.path.join(TESTS_DIR, '..'))
+IDEAPY_PATHNAME = os.path.join(ROOT_DIR, 'ideapy.py')
+
+SERVER_NAME = 'test'
+START_TIMEOUT = 15
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class IdeaPyServer:
+    def __init__(self, files:Dict[str, str], settings:dict = None, virtual_host:dict = None):
+        self.files = files
+        self.settings = settings or {}
+        self.virtual_host = virtual_host or {}
+        self.port = free_port()
+        self.root_dir = None
+        self.process = None
+
+
+    def __enter__(self) -> 'IdeaPyServer':
+        self.root_dir = tempfile.mkdtemp(prefix='ideapy_test_')
+
+        for pathname, source in self.files.items():
+            full_pathname = os.path.join(self.root_dir, pathname)
+            os.makedirs(os.path.dirname(full_pathname), exist_ok=True)
+
+            with open(full_pathname, 'w') as f:
+                f.write(source.lstrip())
+
+        virtual_host = {
+            'document_roots': ['/'],
+            'server_name': SERVER_NAME,
+            'listen_ips': ['127.0.0.1'],
+            'listen_port': self.port
+        }
+        virtual_host.update(self.virtual_host)
+
+        conf = {'_virtual_hosts': [virtual_host]}
+        conf.update(self.settings)
+
+        with open(os.path.join(self.root_dir, 'ideapy.conf.json'), 'w') as f:
+            f.write(json.dumps(conf))
+
+        self._log_file = open(os.path.join(self.root_dir, 'ideapy.log'), 'w')
+        self.process = subprocess.Popen([sys.executable, IDEAPY_PATHNAME], cwd=self.root_dir, stdout=self._log_file, stderr=subprocess.STDOUT)
+
+        #the port is open before start() returns, connection hooks are installed after it
+        deadline = time.time() + START_TIMEOUT
+        while not any(line.endswith(' started') for line in self.log().splitlines()):
+            if time.time() > deadline or self.process.poll() is not None:
+                self.__exit__(None, None, None)
+                raise RuntimeError('IdeaPy did not start on port {port}'.format(port=self.port))
+
+            time.sleep(0.1)
+
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+
+            try:
+                self.process.wait(10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+        self._log_file.close()
+        shutil.rmtree(self.root_dir, ignore_errors=True)
+
+
+    def log(self) -> str:
+        with open(os.path.join(self.root_dir, 'ideapy.log')) as f:
+            return f.read()
+
+
+    def request(self, method:str, path:str, body:bytes = None, headers:dict = None, timeout:float = 10) -> Tuple[int, dict, bytes]:
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=timeout)
+
+        try:
+            request_headers = {'Host': SERVER_NAME}
+            request_headers.update(headers or {})
+
+            connection.request(method, path, body, request_headers)
+            response = connection.getresponse()
+
+            return response.status, dict(response.getheaders()), response.read()
+        finally:
+            connection.close()
+
+
+    def connect(self, timeout:float = 10) -> socket.socket:
+        return socket.create_connection(('127.0.0.1', self.port), timeout)
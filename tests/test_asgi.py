@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from server import IdeaPyServer
+
+
+ENDLESS_STREAM_PAGE = """
+import cherrypy
+
+
+async def app(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'text/plain')]})
+
+    while True:
+        await send({'type': 'http.response.body', 'body': b'x' * 1024, 'more_body': True})
+
+
+cherrypy.response.____ideapy_scope____['____ideapy____'].run_asgi_app(app)
+"""
+
+HELLO_PAGE = """
+import cherrypy
+
+
+async def app(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'text/plain')]})
+    await send({'type': 'http.response.body', 'body': b'hello'})
+
+
+cherrypy.response.____ideapy_scope____['____ideapy____'].run_asgi_app(app)
+"""
+
+COUNTED_STREAM_PAGE = """
+import cherrypy
+
+
+async def app(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 200, 'headers': [(b'content-type', b'text/plain')]})
+
+    for i in range(100):
+        await send({'type': 'http.response.body', 'body': b'%d,' % i, 'more_body': True})
+
+    await send({'type': 'http.response.body', 'body': b'end'})
+
+
+cherrypy.response.____ideapy_scope____['____ideapy____'].run_asgi_app(app)
+"""
+
+
+class ASGITest(unittest.TestCase):
+    def test_stream_longer_than_pending_messages(self):
+        with IdeaPyServer({'counted.py': COUNTED_STREAM_PAGE}) as server:
+            status, headers, body = server.request('GET', '/counted.py')
+
+            self.assertEqual(status, 200)
+            self.assertEqual(body, bytes(''.join('%d,' % i for i in range(100)) + 'end', 'ascii'))
+
+
+    def test_disconnect_mid_stream_frees_event_loop(self):
+        files = {'endless.py': ENDLESS_STREAM_PAGE, 'hello.py': HELLO_PAGE}
+
+        with IdeaPyServer(files) as server:
+            for i in range(3):
+                sock = server.connect()
+                sock.sendall(b'GET /endless.py HTTP/1.1\r\nHost: test\r\n\r\n')
+
+                received = b''
+                while len(received) < 64 * 1024:
+                    data = sock.recv(64 * 1024)
+                    self.assertTrue(data, 'stream ended early')
+                    received += data
+
+                sock.close()
+
+            #the endless applications must not keep the shared event loop (or its executor) busy
+            status, headers, body = server.request('GET', '/hello.py', timeout=5)
+
+            self.assertEqual(status, 200)
+            self.assertEqual(body, b'hello')
+
+
+if __name__ == '__main__':
+    unittest.main()
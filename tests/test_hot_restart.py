@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+import os
+import re
+import sys
+import time
+import signal
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from server import IdeaPyServer
+
+
+PAGE = """
+import time
+import cherrypy
+
+
+time.sleep(0.02)
+cherrypy.response.body = b'served'
+"""
+
+
+class HotRestartTest(unittest.TestCase):
+    def _request_until(self, server, stop:threading.Event, results:list, errors:list):
+        while not stop.is_set():
+            try:
+                status, headers, body = server.request('GET', '/page.py', timeout=10)
+                results.append((status, body))
+            except Exception as x:
+                errors.append(repr(x))
+
+
+    def _new_pid(self, server) -> int:
+        match = re.search(r'new process (\d+) is ready', server.log())
+        return int(match.group(1)) if match else None
+
+
+    def test_no_connection_is_refused_or_reset(self):
+        with IdeaPyServer({'page.py': PAGE}, settings={'HOT_RESTART_ON_SIGUSR2': True}) as server:
+            stop = threading.Event()
+            results = []
+            errors = []
+            threads = [threading.Thread(target=self._request_until, args=(server, stop, results, errors)) for i in range(8)]
+
+            try:
+                for thread in threads:
+                    thread.start()
+
+                time.sleep(0.5)
+                os.kill(server.process.pid, signal.SIGUSR2)
+
+                server.process.wait(30)
+                self.assertIsNotNone(self._new_pid(server), server.log())
+
+                #the new process keeps serving after the previous one exited
+                time.sleep(0.5)
+            finally:
+                stop.set()
+                for thread in threads:
+                    thread.join()
+
+                new_pid = self._new_pid(server)
+                if new_pid is not None:
+                    os.kill(new_pid, signal.SIGTERM)
+
+            self.assertEqual(errors, [])
+            self.assertTrue(results)
+            self.assertEqual(set(results), {(200, b'served')})
+            self.assertIn('drained, exiting', server.log())
+            self.assertNotIn('Traceback', server.log())
+
+
+if __name__ == '__main__':
+    unittest.main()
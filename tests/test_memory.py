@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import time
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from server import IdeaPyServer
+
+
+LEAKING_PAGE = """
+import builtins
+
+
+builtins.__dict__.setdefault('leaked_by_page', []).append(bytearray(64 * 1024))
+print('leaked')
+"""
+
+CLEAN_PAGE = """
+print('clean')
+"""
+
+HOLDING_PAGE = """
+import time
+
+
+held = [bytearray(64 * 1024) for i in range(16)]
+time.sleep(0.2)
+print('held')
+"""
+
+SETTINGS = {'MEMORY_ACCOUNTING': True, 'STATUS_ROUTE': True, 'MEMORY_LEAK_STREAK': 3}
+
+
+class MemoryAccountingTest(unittest.TestCase):
+    def _page_stats(self, server, name:str) -> dict:
+        status, headers, body = server.request('GET', '/server_status/memory')
+        self.assertEqual(status, 200)
+
+        pages = json.loads(body.decode('utf8'))['pages']
+        return next(stats for full_pathname, stats in pages.items() if full_pathname.endswith(name))
+
+
+    def test_leak_is_suspected(self):
+        with IdeaPyServer({'leaking.py': LEAKING_PAGE}, settings=SETTINGS) as server:
+            for i in range(4):
+                server.request('GET', '/leaking.py')
+
+            self.assertTrue(self._page_stats(server, 'leaking.py')['leak_suspected'])
+
+
+    def test_concurrent_requests_do_not_count_as_growth(self):
+        with IdeaPyServer({'clean.py': CLEAN_PAGE, 'holding.py': HOLDING_PAGE}, settings=SETTINGS) as server:
+            running = True
+
+            def hold():
+                while running:
+                    server.request('GET', '/holding.py')
+
+            threads = [threading.Thread(target=hold) for i in range(2)]
+            for thread in threads:
+                thread.start()
+
+            try:
+                time.sleep(0.1)
+                for i in range(6):
+                    server.request('GET', '/clean.py')
+            finally:
+                running = False
+                for thread in threads:
+                    thread.join()
+
+            stats = self._page_stats(server, 'clean.py')
+
+            self.assertFalse(stats['leak_suspected'])
+            self.assertGreater(stats['shared_samples'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import time
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from server import IdeaPyServer
+
+
+SLOW_PAGE = """
+import time
+import cherrypy
+
+
+finish = time.monotonic() + float(cherrypy.request.params.get('seconds', 10))
+while time.monotonic() < finish:
+    time.sleep(0.01)
+
+cherrypy.response.body = b'done'
+"""
+
+BUSY_PAGE = """
+import time
+import cherrypy
+
+
+finish = time.monotonic() + 10
+while time.monotonic() < finish:
+    pass
+
+cherrypy.response.body = b'done'
+"""
+
+FILES = {'slow.py': SLOW_PAGE, 'reports/slow.py': SLOW_PAGE, 'busy.py': BUSY_PAGE}
+
+
+class PageBudgetTest(unittest.TestCase):
+    def _report(self, server) -> dict:
+        status, headers, body = server.request('GET', '/server_status/page_budget')
+        self.assertEqual(status, 200)
+
+        return json.loads(body.decode('utf8'))
+
+
+    def test_deadline(self):
+        with IdeaPyServer(FILES, settings={'PAGE_DEADLINE': 1, 'STATUS_ROUTE': True}) as server:
+            started = time.monotonic()
+            status, headers, body = server.request('GET', '/slow.py')
+
+            self.assertEqual(status, 504)
+            self.assertLess(time.monotonic() - started, 3)
+
+            self.assertEqual(server.request('GET', '/slow.py?seconds=0.1')[:3:2], (200, b'done'))
+
+            report = self._report(server)
+            self.assertEqual(report['deadline_exceeded'], 1)
+            self.assertEqual(report['running'], 0)
+
+
+    def test_cpu_budget(self):
+        with IdeaPyServer(FILES, settings={'PAGE_CPU_BUDGET': 1, 'STATUS_ROUTE': True}) as server:
+            started = time.monotonic()
+            status, headers, body = server.request('GET', '/busy.py')
+
+            self.assertEqual(status, 503)
+            self.assertLess(time.monotonic() - started, 5)
+            self.assertEqual(self._report(server)['cpu_exceeded'], 1)
+
+
+    def test_page_patterns(self):
+        virtual_host = {'page_budget': {'deadline': 1, 'pages': {'/reports/*.py': {'deadline': 3}}}}
+
+        with IdeaPyServer(FILES, virtual_host=virtual_host) as server:
+            self.assertEqual(server.request('GET', '/slow.py?seconds=2')[0], 504)
+            self.assertEqual(server.request('GET', '/reports/slow.py?seconds=2')[:3:2], (200, b'done'))
+            self.assertEqual(server.request('GET', '/reports/slow.py?seconds=5')[0], 504)
+
+
+    def test_pages_finishing_at_their_deadline(self):
+        #the watchdog fires while some pages are already returning, every request still gets its response
+        virtual_host = {'page_budget': {'deadline': 0.3}}
+
+        with IdeaPyServer(FILES, settings={'STATUS_ROUTE': True}, virtual_host=virtual_host) as server:
+            results = []
+            errors = []
+
+            def request(index:int):
+                try:
+                    results.append(server.request('GET', '/slow.py?seconds={seconds}'.format(seconds = 0.2 + index % 7 * 0.05))[0])
+                except Exception as x:
+                    errors.append(repr(x))
+
+            threads = [threading.Thread(target=request, args=(i,)) for i in range(42)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(errors, [])
+            self.assertEqual(set(results) - {200, 504}, set())
+            self.assertEqual(self._report(server)['running'], 0)
+            self.assertNotIn('Traceback', server.log())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from server import IdeaPyServer, ROOT_DIR, SERVER_NAME, free_port
+
+
+PID_PAGE = """
+import os
+import cherrypy
+
+
+cherrypy.response.body = bytes('{pid} {file}'.format(pid = os.getpid(), file = ____ideapy_file____), 'utf8')
+"""
+
+CRASHING_PAGE = """
+import os
+
+os._exit(3)
+"""
+
+UNGUARDED_MAIN = """
+import sys
+
+sys.path.insert(0, {root_dir})
+
+from ideapy import IdeaPy
+
+
+idea = IdeaPy()
+idea.start()
+idea.block()
+"""
+
+SETTINGS = {'PAGE_POOL_SIZE': 1, 'STATUS_ROUTE': True}
+VIRTUAL_HOST = {'page_execution': 'process'}
+
+
+class PagePoolTest(unittest.TestCase):
+    def _report(self, server) -> dict:
+        status, headers, body = server.request('GET', '/server_status/page_pool')
+        self.assertEqual(status, 200)
+
+        return json.loads(body.decode('utf8'))
+
+
+    def test_page_runs_in_worker_process_with_page_scope(self):
+        with IdeaPyServer({'pid.py': PID_PAGE}, settings=SETTINGS, virtual_host=VIRTUAL_HOST) as server:
+            status, headers, body = server.request('GET', '/pid.py')
+            self.assertEqual(status, 200)
+
+            pid, file = body.decode('utf8').split(' ')
+            self.assertNotEqual(int(pid), server.process.pid)
+            self.assertEqual(file, '/pid.py')
+
+            #the same worker serves the next page
+            self.assertEqual(server.request('GET', '/pid.py')[2].decode('utf8').split(' ')[0], pid)
+
+
+    def test_crashed_worker_is_replaced(self):
+        with IdeaPyServer({'pid.py': PID_PAGE, 'crash.py': CRASHING_PAGE}, settings=SETTINGS, virtual_host=VIRTUAL_HOST) as server:
+            pid = server.request('GET', '/pid.py')[2].decode('utf8').split(' ')[0]
+
+            status, headers, body = server.request('GET', '/crash.py')
+            self.assertEqual(status, 500)
+
+            status, headers, body = server.request('GET', '/pid.py', timeout=30)
+            self.assertEqual(status, 200)
+            self.assertNotEqual(body.decode('utf8').split(' ')[0], pid)
+
+            report = self._report(server)
+            self.assertEqual(report['crashed'], 1)
+            self.assertEqual(report['started'], 2)
+
+
+    def test_unguarded_main_script_fails_loudly(self):
+        root_dir = tempfile.mkdtemp(prefix='ideapy_test_')
+
+        try:
+            conf = {
+                'PAGE_POOL_SIZE': 1,
+                'PAGE_POOL_START_METHOD': 'spawn',
+                '_virtual_hosts': [{
+                    'document_roots': ['/'],
+                    'server_name': SERVER_NAME,
+                    'listen_ips': ['127.0.0.1'],
+                    'listen_port': free_port(),
+                    'page_execution': 'process'
+                }]
+            }
+
+            with open(os.path.join(root_dir, 'ideapy.conf.json'), 'w') as f:
+                f.write(json.dumps(conf))
+
+            with open(os.path.join(root_dir, 'main.py'), 'w') as f:
+                f.write(UNGUARDED_MAIN.format(root_dir = repr(ROOT_DIR)))
+
+            completed = subprocess.run([sys.executable, 'main.py'], cwd=root_dir, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=60)
+            output = completed.stdout.decode('utf8', 'replace')
+
+            self.assertNotEqual(completed.returncode, 0, output)
+            self.assertIn('called in a page pool worker process', output)
+            self.assertIn('did not start', output)
+        finally:
+            shutil.rmtree(root_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from server import IdeaPyServer
+
+
+COUNTING_STREAM_PAGE = """
+import cherrypy
+
+
+idea = cherrypy.response.____ideapy_scope____['____ideapy____']
+
+
+def stream_it():
+    size = 0
+    for chunk in idea.iter_body():
+        size += len(chunk)
+
+    yield str(size)
+
+
+idea.stream(stream_it)
+"""
+
+IGNORING_PAGE = """
+print('ignored')
+"""
+
+BODY_SIZE = 500 * 1024
+
+
+class RequestBodyTest(unittest.TestCase):
+    def test_stream_reads_request_body(self):
+        with IdeaPyServer({'count.py': COUNTING_STREAM_PAGE}, virtual_host={'stream_request_body': True}) as server:
+            status, headers, body = server.request('POST', '/count.py', b'x' * BODY_SIZE, {'Content-Type': 'application/octet-stream'})
+
+            self.assertEqual(status, 200)
+            self.assertEqual(body, bytes(str(BODY_SIZE), 'ascii'))
+
+
+    def test_unread_body_keeps_connection_usable(self):
+        with IdeaPyServer({'ignore.py': IGNORING_PAGE, 'a.txt': 'a'}, virtual_host={'stream_request_body': True}) as server:
+            sock = server.connect()
+
+            try:
+                request = b'POST /ignore.py HTTP/1.1\r\nHost: test\r\nContent-Type: application/octet-stream\r\nContent-Length: %d\r\n\r\n' % BODY_SIZE
+                sock.sendall(request + b'x' * BODY_SIZE + b'GET /a.txt HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n')
+
+                response = b''
+                while True:
+                    data = sock.recv(64 * 1024)
+                    if not data:
+                        break
+
+                    response += data
+            finally:
+                sock.close()
+
+            self.assertEqual(response.count(b'HTTP/1.1 200 OK'), 2)
+            self.assertTrue(response.endswith(b'\r\n\r\na'))
+
+
+    def test_virtual_host_limit_is_answered_without_reading_the_body(self):
+        with IdeaPyServer({'ignore.py': IGNORING_PAGE}, virtual_host={'max_request_body_size': 1024}) as server:
+            sock = server.connect(10)
+            started = time.monotonic()
+
+            try:
+                request = b'POST /ignore.py HTTP/1.1\r\nHost: test\r\nContent-Type: application/octet-stream\r\nContent-Length: %d\r\n\r\n' % (50 * 1024 * 1024)
+                sock.sendall(request + b'x' * (64 * 1024))
+
+                response = sock.recv(1024)
+            finally:
+                sock.close()
+
+            self.assertTrue(response.startswith(b'HTTP/1.1 413'), response[:40])
+            self.assertLess(time.monotonic() - started, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import time
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from server import IdeaPyServer
+
+
+FILES = {
+    'public/index.txt': 'public index',
+    'secret.txt': 'secret'
+}
+
+SLOW_PAGE = """
+import time
+import cherrypy
+
+
+time.sleep(1.5)
+cherrypy.response.body = b'slow'
+"""
+
+SETTINGS = {'REQUEST_CLASSES': {'static': {'threads': 2, 'queue': 8}}}
+
+
+class RequestClassesTest(unittest.TestCase):
+    def test_unusual_targets_are_answered(self):
+        with IdeaPyServer(FILES, settings=SETTINGS, virtual_host={'document_roots': ['/public/']}) as server:
+            for target in (b'/index%00.txt', b'/..%2fsecret.txt', b'/%2e%2e/secret.txt', b'/%ff%fe'):
+                sock = server.connect(5)
+
+                try:
+                    sock.sendall(b'GET ' + target + b' HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n')
+
+                    response = b''
+                    while True:
+                        data = sock.recv(64 * 1024)
+                        if not data:
+                            break
+
+                        response += data
+                finally:
+                    sock.close()
+
+                self.assertTrue(response.startswith(b'HTTP/1.1 4'), (target, response[:40]))
+
+            status, headers, body = server.request('GET', '/index.txt', timeout=5)
+
+            self.assertEqual(status, 200)
+            self.assertEqual(body, b'public index')
+            self.assertNotIn('classification failed', server.log())
+
+
+    def test_full_class_queue_is_answered_with_503(self):
+        files = dict(FILES)
+        files['public/slow.py'] = SLOW_PAGE
+        settings = {'REQUEST_CLASSES': {'page': {'threads': 1, 'queue': 1}}}
+
+        with IdeaPyServer(files, settings=settings, virtual_host={'document_roots': ['/public/']}) as server:
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(server.request('GET', '/slow.py'))) for i in range(3)]
+
+            for thread in threads:
+                thread.start()
+                time.sleep(0.2)
+
+            #the third one waits for neither the page nor the queue
+            threads[2].join(1)
+            self.assertFalse(threads[2].is_alive())
+
+            #other classes go on to cheroot's worker threads
+            self.assertEqual(server.request('GET', '/index.txt', timeout=1)[2], b'public index')
+
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(sorted(status for status, headers, body in results), [200, 200, 503])
+
+            rejected = next(headers for status, headers, body in results if status == 503)
+            self.assertIn('Retry-After', rejected)
+
+
+if __name__ == '__main__':
+    unittest.main()
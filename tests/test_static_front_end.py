@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import socket
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from server import IdeaPyServer
+
+
+FILES = {
+    'public/index.txt': 'public index',
+    'public/sub/page.txt': 'public page',
+    'secret.txt': 'secret'
+}
+
+
+class StaticFrontEndTest(unittest.TestCase):
+    def _get(self, server, target:bytes) -> bytes:
+        sock = server.connect(5)
+
+        try:
+            sock.sendall(b'GET ' + target + b' HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n')
+
+            response = b''
+            while True:
+                data = sock.recv(64 * 1024)
+                if not data:
+                    return response
+
+                response += data
+        finally:
+            sock.close()
+
+
+    def test_targets_do_not_leave_document_root(self):
+        for settings in ({'STATIC_FRONTEND': True}, {}):
+            with IdeaPyServer(FILES, settings=settings, virtual_host={'document_roots': ['/public/']}) as server:
+                self.assertTrue(self._get(server, b'/sub/page.txt').endswith(b'\r\n\r\npublic page'))
+
+                for target in (b'/sub/..%2f..%2fsecret.txt', b'/..%2Fsecret.txt', b'/%2e%2e/secret.txt', b'/sub/%2e%2e/%2e%2e/secret.txt'):
+                    response = self._get(server, target)
+
+                    self.assertTrue(response.startswith(b'HTTP/1.1 '), (settings, target))
+                    self.assertFalse(response.endswith(b'secret'), (settings, target))
+
+
+    def test_nul_in_target(self):
+        with IdeaPyServer(FILES, settings={'STATIC_FRONTEND': True}, virtual_host={'document_roots': ['/public/']}) as server:
+            for i in range(3):
+                response = self._get(server, b'/index%00.txt')
+                self.assertTrue(response.startswith(b'HTTP/1.1 4'), response[:40])
+
+            status, headers, body = server.request('GET', '/index.txt', timeout=5)
+
+            self.assertEqual(status, 200)
+            self.assertEqual(body, b'public index')
+            self.assertNotIn('Traceback', server.log())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import json
+import time
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.realpath(__file__)))
+
+from server import IdeaPyServer
+
+
+SLEEPING_STREAM_PAGE = """
+import time
+import cherrypy
+
+
+def stream_it():
+    for i in range(3):
+        time.sleep(0.5)
+        yield '%d,' % i
+
+
+cherrypy.response.____ideapy_scope____['____ideapy____'].stream(stream_it)
+"""
+
+ASYNC_SLEEPING_STREAM_PAGE = """
+import asyncio
+import cherrypy
+
+
+async def stream_it():
+    for i in range(3):
+        await asyncio.sleep(0.5)
+        yield '%d,' % i
+
+
+cherrypy.response.____ideapy_scope____['____ideapy____'].stream(stream_it)
+"""
+
+BLOCKING_STREAM_PAGE = """
+import time
+import cherrypy
+
+
+idea = cherrypy.response.____ideapy_scope____['____ideapy____']
+
+
+def stream_it():
+    yield 'first,'
+    if cherrypy.request.query_string == 'flush':
+        idea.flush()
+
+    time.sleep(3)
+    yield 'last'
+
+
+idea.stream(stream_it)
+"""
+
+
+class StreamTest(unittest.TestCase):
+    def _get_concurrently(self, server, path:str, count:int) -> list:
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(server.request('GET', path))) for i in range(count)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return results
+
+
+    def _first_chunk_time(self, server, path:str) -> float:
+        sock = server.connect()
+        started = time.monotonic()
+
+        try:
+            sock.sendall(bytes('GET {path} HTTP/1.1\r\nHost: test\r\n\r\n'.format(path=path), 'ascii'))
+
+            received = b''
+            while not b'first,' in received:
+                data = sock.recv(1024)
+                self.assertTrue(data, 'stream ended early')
+                received += data
+
+            return time.monotonic() - started
+        finally:
+            sock.close()
+
+
+    def test_concurrent_streams_of_one_page(self):
+        with IdeaPyServer({'sleeping.py': SLEEPING_STREAM_PAGE}) as server:
+            for status, headers, body in self._get_concurrently(server, '/sleeping.py', 6):
+                self.assertEqual(status, 200)
+                self.assertEqual(body, b'0,1,2,')
+
+
+    def test_offloaded_sleeping_generators_are_not_serialized(self):
+        settings = {'STREAM_OFFLOAD': True, 'STREAM_OFFLOAD_THREADS': 2}
+
+        with IdeaPyServer({'sleeping.py': SLEEPING_STREAM_PAGE}, settings=settings) as server:
+            started = time.monotonic()
+            results = self._get_concurrently(server, '/sleeping.py', 6)
+            elapsed = time.monotonic() - started
+
+            for status, headers, body in results:
+                self.assertEqual(status, 200)
+                self.assertEqual(body, b'0,1,2,')
+
+            #on 2 stream threads one after another it would take 4.5 s, the rest stays in worker threads
+            self.assertLess(elapsed, 3.5)
+
+
+    def test_offloaded_async_generators_hold_no_thread(self):
+        settings = {'STREAM_OFFLOAD': True, 'STREAM_OFFLOAD_THREADS': 1}
+
+        with IdeaPyServer({'sleeping.py': ASYNC_SLEEPING_STREAM_PAGE}, settings=settings) as server:
+            started = time.monotonic()
+            results = self._get_concurrently(server, '/sleeping.py', 24)
+            elapsed = time.monotonic() - started
+
+            for status, headers, body in results:
+                self.assertEqual(status, 200)
+                self.assertEqual(body, b'0,1,2,')
+
+            #3 rounds of 1.5 s if the streams held the 10 worker threads
+            self.assertLess(elapsed, 3.5)
+
+
+    def test_flushed_output_is_written_while_page_blocks(self):
+        for settings in ({}, {'STREAM_OFFLOAD': True}):
+            settings.update({'STREAM_COALESCE': True, 'STREAM_COALESCE_BYTES': 1024 * 1024, 'STREAM_COALESCE_MS': 60000})
+
+            with IdeaPyServer({'blocking.py': BLOCKING_STREAM_PAGE}, settings=settings) as server:
+                self.assertLess(self._first_chunk_time(server, '/blocking.py?flush'), 1.5, settings)
+
+
+    def test_offloaded_output_is_written_when_due_while_page_blocks(self):
+        settings = {'STREAM_OFFLOAD': True, 'STREAM_COALESCE': True, 'STREAM_COALESCE_BYTES': 1024 * 1024, 'STREAM_COALESCE_MS': 100}
+
+        with IdeaPyServer({'blocking.py': BLOCKING_STREAM_PAGE}, settings=settings) as server:
+            self.assertLess(self._first_chunk_time(server, '/blocking.py'), 1.5)
+
+
+    def test_coalesced_stream_uses_no_stream_thread(self):
+        settings = {'STREAM_COALESCE': True, 'STATUS_ROUTE': True}
+
+        with IdeaPyServer({'sleeping.py': SLEEPING_STREAM_PAGE}, settings=settings) as server:
+            thread = threading.Thread(target=lambda: self.assertEqual(server.request('GET', '/sleeping.py')[2], b'0,1,2,'))
+            thread.start()
+            time.sleep(0.7)
+
+            status, headers, body = server.request('GET', '/server_status/streams')
+            thread.join()
+
+            self.assertEqual(json.loads(body.decode('utf8'))['in_threads'], 0)
+
+
+    def test_flush_of_pooled_page(self):
+        settings = {'STREAM_COALESCE': True, 'STREAM_COALESCE_BYTES': 1024 * 1024, 'STREAM_COALESCE_MS': 60000, 'PAGE_POOL_SIZE': 1}
+
+        with IdeaPyServer({'blocking.py': BLOCKING_STREAM_PAGE}, settings=settings, virtual_host={'page_execution': 'process'}) as server:
+            self.assertLess(self._first_chunk_time(server, '/blocking.py?flush'), 1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()